@@ -10,8 +10,13 @@ from rotary_encoder import RotaryEncoder
 import digitalio
 import adafruit_adxl34x
 import math
+import struct
+import microcontroller
+import alarm
 import neopixel
 from rainbowio import colorwheel
+from levels import maze_levels
+from level_limits import level_time_limits
 
 # Initialize display
 displayio.release_displays()
@@ -23,9 +28,16 @@ display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
 encoder = RotaryEncoder(board.D3, board.D2, pulses_per_detent=1)
 
 # Initialize button (D1 pin)
-button = digitalio.DigitalInOut(board.D1)
-button.direction = digitalio.Direction.INPUT
-button.pull = digitalio.Pull.UP
+button_pin = board.D1
+
+def init_button():
+    """Claim the button pin as a pulled-up input"""
+    pin = digitalio.DigitalInOut(button_pin)
+    pin.direction = digitalio.Direction.INPUT
+    pin.pull = digitalio.Pull.UP
+    return pin
+
+button = init_button()
 
 # Initialize accelerometer
 accelerometer = adafruit_adxl34x.ADXL345(i2c)
@@ -51,6 +63,7 @@ difficulties = ["EASY", "NORMAL", "HARD"]
 current_level = 0
 score = 0
 countdown_time = 0
+level_time_limit = 0
 level_start_time = 0
 player_x, player_y = 0, 0
 exit_x, exit_y = 0, 0
@@ -75,304 +88,63 @@ direction_start_time = {
 last_direction_time = 0
 direction_cooldown = 0.5
 
+# ADXL345 registers for activity/inactivity sensing
+ADXL345_THRESH_ACT = 0x24
+ADXL345_THRESH_INACT = 0x25
+ADXL345_TIME_INACT = 0x26
+ADXL345_ACT_INACT_CTL = 0x27
+ADXL345_BW_RATE = 0x2C
+ADXL345_POWER_CTL = 0x2D
+ADXL345_INT_ENABLE = 0x2E
+ADXL345_INT_SOURCE = 0x30
+ADXL345_ACTIVITY = 0x10
+ADXL345_INACTIVITY = 0x08
+
+# Power management
+accel_int_pin = None  # Pin wired to ADXL345 INT1 to wake on tilt, None if not wired
+# AC-coupled activity is measured from the pose where inactivity fired. Angles
+# are only reused while within still_angle of level, so a tilt to angle_threshold
+# changes an axis by at least sin(20) - sin(3) ~ 0.29 g, above THRESH_ACT
+activity_threshold = 4  # 62.5 mg/LSB, 0.25 g
+inactivity_threshold = 3  # 62.5 mg/LSB
+still_angle = 3  # Degrees from level within which still readings are reused
+accel_event_poll_frames = 4  # Frames between INT_SOURCE reads while playing
+inactivity_time = 3  # Seconds still before the ADXL345 reports inactivity
+idle_dim_timeout = 15  # Seconds without input before the display dims
+idle_sleep_timeout = 30  # Seconds without input before the display turns off
+idle_poll_interval = 0.25  # Light sleep period while the display is off
+dim_brightness = 0.1
+last_input_time = 0
+display_dimmed = False
+display_sleeping = False
+accel_moving = True
+accel_angles = None  # Last tilt angles, reused while the device is still and level
+accel_poll_count = 0
+
+# Resume snapshot stored in NVM: magic, version, difficulty, level, score,
+# player x, player y, remaining seconds rounded up, CRC-16
+snapshot_format = "<2sBBBHBBB"
+snapshot_size = struct.calcsize(snapshot_format) + 2
+snapshot_magic = b"MZ"
+snapshot_version = 3
+snapshot_debounce = 10  # Minimum seconds between move checkpoints, NVM is flash-backed
+snapshot_pending = False  # A move happened since the last checkpoint
+last_snapshot = None
+last_snapshot_time = 0
+
 # Display related variables
 current_display_group = None
+game_screen_labels = {}  # Dynamic labels of the current game screen
 maze_background_cache = {}  # Cache maze background element positions
-current_maze_key = None
-
-# Maze definitions
-easy_levels = [
-    [
-        "########",
-        "#S     #",
-        "#      #",
-        "#      #",
-        "#      #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# ##   #",
-        "#      #",
-        "#      #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "#  ##  #",
-        "#      #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# ###  #",
-        "#      #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "#  ##  #",
-        "#   #  #",
-        "#   #  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "#  #   #",
-        "#  #   #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "#  #   #",
-        "#  ##  #",
-        "#      #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# #### #",
-        "#      #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "#  #####",
-        "#      #",
-        "# #### #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# ###  #",
-        "#   #  #",
-        "# ###  #",
-        "#     E#",
-        "########",
-    ],
-]
-
-normal_levels = [
-    [
-        "########",
-        "#     S#",
-        "#      #",
-        "#      #",
-        "#      #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#   ## #",
-        "#      #",
-        "#      #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#  ##  #",
-        "#      #",
-        "#  ##  #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#  ### #",
-        "#      #",
-        "#  ##  #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#  ##  #",
-        "#  #   #",
-        "#  #   #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#   # S#",
-        "#   #  #",
-        "#   #  #",
-        "#  ##  #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#   # S#",
-        "#   #  #",
-        "#  ##  #",
-        "#      #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "# #### #",
-        "#      #",
-        "#  ##  #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#####  #",
-        "#      #",
-        "# #### #",
-        "#E     #",
-        "########",
-    ],
-    [
-        "########",
-        "#     S#",
-        "#  ### #",
-        "#  #   #",
-        "#  ### #",
-        "#E     #",
-        "########",
-    ],
-]
-
-hard_levels = [
-    [
-        "########",
-        "#S     #",
-        "# ###  #",
-        "#      #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "#  ##  #",
-        "#   #  #",
-        "#   #  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "#  #   #",
-        "#  #   #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "#  #   #",
-        "#  ##  #",
-        "#      #",
-        "#    E #",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# #### #",
-        "#      #",
-        "#  ##  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "#  #####",
-        "#      #",
-        "# #### #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# ###  #",
-        "#   #  #",
-        "# ###  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S     #",
-        "# ###  #",
-        "#   #  #",
-        "### #  #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "# # ## #",
-        "# #  # #",
-        "# #### #",
-        "#     E#",
-        "########",
-    ],
-    [
-        "########",
-        "#S #   #",
-        "# ###  #",
-        "#   #  #",
-        "### #  #",
-        "#     E#",
-        "########",
-    ],
-]
-
-# Organize levels by difficulty
-maze_levels = [
-    easy_levels,    # selected_difficulty == 0
-    normal_levels,  # selected_difficulty == 1
-    hard_levels,    # selected_difficulty == 2
-]
-
-# Set level time based on difficulty
-level_times = {
-    "EASY": 60,
-    "NORMAL": 45, 
-    "HARD": 30
-}
+prepared_level = None  # Next level's parsed positions and game screen, built ahead of time
+screens = {}  # Preconstructed screen group for each state
+screen_labels = {}  # Labels updated in place on the preconstructed screens
+result_options = ["RESTART"]
+
+# Maze drawing area parameters
+cell_size = 6
+maze_start_x = 65
+maze_start_y = 5
 
 def calculate_angles(x, y, z):
     """Calculate X-axis and Y-axis angles (relative to gravity direction)"""
@@ -425,12 +197,17 @@ def check_direction(angle_x, angle_y, current_time):
     
     return direction
 
-def flash_led(color, times=2, delay=0.3):
-    """Flash LED light"""
-    for _ in range(times):
+def flash_led(color, times=2, delay=0.3, work=None):
+    """Flash LED light, optionally running work during the first lit period"""
+    for i in range(times):
         pixels.fill(color)
         pixels.show()
-        time.sleep(delay)
+        if work is not None and i == 0:
+            work_start = time.monotonic()
+            work()
+            time.sleep(max(0, delay - (time.monotonic() - work_start)))
+        else:
+            time.sleep(delay)
         pixels.fill((0, 0, 0))
         pixels.show()
         time.sleep(delay)
@@ -446,8 +223,8 @@ def rainbow_cycle(duration=3):
             pixels.show()
             time.sleep(0.01)
 
-def create_splash_screen():
-    """Create splash screen"""
+def build_splash_screen():
+    """Build splash screen"""
     group = displayio.Group()
     
     title_label = label.Label(terminalio.FONT, text="Maze Run", x=35, y=15, scale=1)
@@ -460,24 +237,29 @@ def create_splash_screen():
     
     return group
 
-def create_difficulty_screen():
-    """Create difficulty selection screen"""
+def build_difficulty_screen():
+    """Build difficulty selection screen"""
     group = displayio.Group()
     
     title_label = label.Label(terminalio.FONT, text="SELECT MODE", x=30, y=10, scale=1)
     group.append(title_label)
     
     y_pos = 30
+    option_labels = []
     for i, difficulty in enumerate(difficulties):
         prefix = "> " if i == selected_difficulty else "  "
         diff_label = label.Label(terminalio.FONT, text=f"{prefix}{difficulty}", x=35, y=y_pos, scale=1)
         group.append(diff_label)
+        option_labels.append(diff_label)
         y_pos += 15
     
+    screen_labels["difficulty_options"] = option_labels
+    screen_labels["difficulty_cursor"] = selected_difficulty
+    
     return group
 
-def create_game_start_screen():
-    """Create game start screen"""
+def build_game_start_screen():
+    """Build game start screen"""
     group = displayio.Group()
     
     difficulty_text = f"MODE: {difficulties[selected_difficulty]}"
@@ -487,18 +269,18 @@ def create_game_start_screen():
     group.append(diff_label)
     group.append(start_label)
     
+    screen_labels["start_mode"] = diff_label
+    
     return group
 
-def create_game_screen():
-    """Create game play screen - simplified version to reduce flickering"""
-    global current_display_group, current_maze_key
-    
+def build_game_screen(level_index, start_x, start_y):
+    """Build game play screen for a level, return group and its dynamic labels"""
     group = displayio.Group()
-    maze_key = f"{selected_difficulty}_{current_level}"
+    maze_key = f"{selected_difficulty}_{level_index}"
     
     # Left side information area
-    level_text = f"L:{current_level+1}/10"
-    time_text = f"T:{int(countdown_time)}"
+    level_text = f"L:{level_index+1}/10"
+    time_text = f"T:{int(level_time_limits[selected_difficulty][level_index])}"
     score_text = f"S:{score}"
     
     level_label = label.Label(terminalio.FONT, text=level_text, x=5, y=10, scale=1)
@@ -509,23 +291,17 @@ def create_game_screen():
     group.append(time_label)
     group.append(score_label)
     
-    # Maze area - use cached background info if maze hasn't changed
-    maze = maze_levels[selected_difficulty][current_level]
-    
-    # Maze drawing area parameters
-    cell_size = 6
-    start_x = 65
-    start_y = 5
+    # Maze area - background positions are computed once per maze
+    maze = maze_levels[selected_difficulty][level_index]
     
-    # Draw maze (only update background when maze changes)
-    if maze_key != current_maze_key or maze_key not in maze_background_cache:
+    if maze_key not in maze_background_cache:
         # Store maze background information
         maze_background_cache[maze_key] = []
         
         for row in range(min(len(maze), 7)):
             for col in range(min(len(maze[0]), 8)):
-                x_pos = start_x + col * cell_size
-                y_pos = start_y + row * cell_size
+                x_pos = maze_start_x + col * cell_size
+                y_pos = maze_start_y + row * cell_size
                 
                 cell_char = maze[row][col]
                 if cell_char == '#':  # Wall
@@ -534,16 +310,14 @@ def create_game_screen():
                     maze_background_cache[maze_key].append(("E", x_pos, y_pos))
     
     # Draw cached maze background
-    for char_type, x_pos, y_pos in maze_background_cache.get(maze_key, []):
-        if char_type in ("#", "E"):
-            char_label = label.Label(terminalio.FONT, text=char_type, x=x_pos, y=y_pos, scale=1)
-            group.append(char_label)
+    for char_type, x_pos, y_pos in maze_background_cache[maze_key]:
+        char_label = label.Label(terminalio.FONT, text=char_type, x=x_pos, y=y_pos, scale=1)
+        group.append(char_label)
     
     # Draw player position
-    player_x_pos = start_x + player_x * cell_size
-    player_y_pos = start_y + player_y * cell_size
+    player_x_pos = maze_start_x + start_x * cell_size
+    player_y_pos = maze_start_y + start_y * cell_size
     
-    # Draw player position
     player_label = label.Label(terminalio.FONT, text="P", x=player_x_pos, y=player_y_pos, scale=1)
     group.append(player_label)
     
@@ -553,49 +327,146 @@ def create_game_screen():
     group.append(box_left)
     group.append(box_right)
     
-    current_maze_key = maze_key
-    current_display_group = group
+    labels = {
+        "time": time_label,
+        "time_text": time_text,
+        "player": player_label,
+        "box_left": box_left,
+        "box_right": box_right,
+    }
     
-    return group
+    return group, labels
 
-def create_result_screen(is_victory):
-    """Create result screen"""
+def update_game_screen():
+    """Update timer and player position on the current game screen in place"""
+    time_text = f"T:{int(countdown_time)}"
+    if time_text != game_screen_labels["time_text"]:
+        game_screen_labels["time"].text = time_text
+        game_screen_labels["time_text"] = time_text
+    
+    player_x_pos = maze_start_x + player_x * cell_size
+    player_y_pos = maze_start_y + player_y * cell_size
+    
+    game_screen_labels["player"].x = player_x_pos
+    game_screen_labels["player"].y = player_y_pos
+    game_screen_labels["box_left"].x = player_x_pos - 2
+    game_screen_labels["box_left"].y = player_y_pos
+    game_screen_labels["box_right"].x = player_x_pos + 3
+    game_screen_labels["box_right"].y = player_y_pos
+
+def build_result_screen():
+    """Build result screen shared by game over and victory"""
     group = displayio.Group()
     
-    result_text = "VICTORY!" if is_victory else "GAME OVER"
-    result_label = label.Label(terminalio.FONT, text=result_text, x=35, y=10, scale=1)
+    result_label = label.Label(terminalio.FONT, text="GAME OVER", x=35, y=10, scale=1)
     score_label = label.Label(terminalio.FONT, text=f"SCORE: {score}", x=35, y=25, scale=1)
     
     # Button selection
-    buttons = ["RESTART"]
     y_pos = 40
-    for i, btn in enumerate(buttons):
+    option_labels = []
+    for i, btn in enumerate(result_options):
         prefix = "> " if i == selected_difficulty else "  "
         btn_label = label.Label(terminalio.FONT, text=f"{prefix}{btn}", x=20, y=y_pos, scale=1)
         group.append(btn_label)
+        option_labels.append(btn_label)
         y_pos += 15
     
     group.append(result_label)
     group.append(score_label)
     
+    screen_labels["result_title"] = result_label
+    screen_labels["result_score"] = score_label
+    screen_labels["result_options"] = option_labels
+    
     return group
 
-def load_level(level_index):
-    """Load specified level"""
-    global player_x, player_y, exit_x, exit_y, level_start_time, countdown_time
-    
+def update_option_cursor(option_labels, options, selected):
+    """Move the "> " cursor to the selected option"""
+    for i, option_label in enumerate(option_labels):
+        prefix = "> " if i == selected else "  "
+        text = f"{prefix}{options[i]}"
+        if option_label.text != text:
+            option_label.text = text
+
+def update_difficulty_screen():
+    """Move the difficulty cursor, touching only the two affected labels"""
+    option_labels = screen_labels["difficulty_options"]
+    previous = screen_labels["difficulty_cursor"]
+    if previous != selected_difficulty:
+        option_labels[previous].text = f"  {difficulties[previous]}"
+    option_labels[selected_difficulty].text = f"> {difficulties[selected_difficulty]}"
+    screen_labels["difficulty_cursor"] = selected_difficulty
+
+def update_game_start_screen():
+    """Show the selected difficulty on the game start screen"""
+    screen_labels["start_mode"].text = f"MODE: {difficulties[selected_difficulty]}"
+
+def update_result_screen():
+    """Show outcome, score and cursor on the result screen"""
+    screen_labels["result_title"].text = "VICTORY!" if current_state == STATE_RESULT else "GAME OVER"
+    screen_labels["result_score"].text = f"SCORE: {score}"
+    update_option_cursor(screen_labels["result_options"], result_options, selected_difficulty)
+
+def build_screens():
+    """Build every menu screen once and register it by state"""
+    result_group = build_result_screen()
+    
+    screens[STATE_SPLASH] = build_splash_screen()
+    screens[STATE_DIFFICULTY_SELECT] = build_difficulty_screen()
+    screens[STATE_GAME_START] = build_game_start_screen()
+    screens[STATE_GAME_OVER] = result_group
+    screens[STATE_RESULT] = result_group
+
+def show_state(state):
+    """Switch to a state and display its refreshed screen"""
+    global current_state
+    
+    current_state = state
+    updater = screen_updaters.get(state)
+    if updater is not None:
+        updater()
+    display.root_group = screens[state]
+
+def parse_level(level_index):
+    """Find start point (S) and end point (E) of a level"""
     maze = maze_levels[selected_difficulty][level_index]
+    start_x, start_y = 0, 0
+    end_x, end_y = 0, 0
     
-    # Find start point (S) and end point (E)
     for y, row in enumerate(maze):
         for x, cell in enumerate(row):
             if cell == 'S':
-                player_x, player_y = x, y
+                start_x, start_y = x, y
             elif cell == 'E':
-                exit_x, exit_y = x, y
+                end_x, end_y = x, y
+    
+    return start_x, start_y, end_x, end_y
+
+def prepare_level(level_index):
+    """Parse a level and build its game screen ahead of time"""
+    global prepared_level
+    
+    start_x, start_y, end_x, end_y = parse_level(level_index)
+    group, labels = build_game_screen(level_index, start_x, start_y)
+    prepared_level = (level_index, start_x, start_y, end_x, end_y, group, labels)
+
+def load_level(level_index):
+    """Load specified level, swapping in its prepared game screen"""
+    global player_x, player_y, exit_x, exit_y, level_start_time, countdown_time, level_time_limit
+    global prepared_level, current_display_group, game_screen_labels
+    
+    if prepared_level is None or prepared_level[0] != level_index:
+        prepare_level(level_index)
+    
+    _, player_x, player_y, exit_x, exit_y, current_display_group, game_screen_labels = prepared_level
+    prepared_level = None
     
     level_start_time = time.monotonic()
-    countdown_time = level_times[difficulties[selected_difficulty]]
+    level_time_limit = level_time_limits[selected_difficulty][level_index]
+    countdown_time = level_time_limit
+    update_game_screen()
+    screens[STATE_GAME_PLAYING] = current_display_group
+    display.root_group = current_display_group
 
 def move_player(direction):
     """Move player"""
@@ -626,153 +497,419 @@ def check_level_complete():
     """Check if level is completed"""
     return player_x == exit_x and player_y == exit_y
 
-# Initial display
-display.root_group = create_splash_screen()
+def crc16(data):
+    """CRC-16/CCITT-FALSE checksum"""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+def write_snapshot(data):
+    """Write snapshot bytes to NVM, skipping unchanged writes"""
+    global last_snapshot
+    
+    if microcontroller.nvm is None or data == last_snapshot:
+        return
+    microcontroller.nvm[0:snapshot_size] = data
+    last_snapshot = data
+
+def save_snapshot():
+    """Checkpoint the running game to NVM"""
+    global last_snapshot_time, snapshot_pending
+    
+    # Time is only lost on resume if rounded down, and 0 would fail validation
+    remaining = min(0xFF, math.ceil(countdown_time))
+    if remaining == 0:
+        return
+    payload = struct.pack(snapshot_format, snapshot_magic, snapshot_version, selected_difficulty,
+                          current_level, score, player_x, player_y, remaining)
+    write_snapshot(payload + struct.pack("<H", crc16(payload)))
+    last_snapshot_time = time.monotonic()
+    snapshot_pending = False
+
+def clear_snapshot():
+    """Invalidate the NVM snapshot once the game has ended"""
+    write_snapshot(bytes(snapshot_size))
+
+def load_snapshot():
+    """Return the validated NVM snapshot fields, or None"""
+    if microcontroller.nvm is None:
+        return None
+    
+    data = bytes(microcontroller.nvm[0:snapshot_size])
+    payload = data[:-2]
+    if struct.unpack("<H", data[-2:])[0] != crc16(payload):
+        return None
+    
+    magic, version, difficulty, level, saved_score, x, y, remaining = struct.unpack(snapshot_format, payload)
+    if magic != snapshot_magic or version != snapshot_version:
+        return None
+    if difficulty >= len(maze_levels) or level >= len(maze_levels[difficulty]):
+        return None
+    maze = maze_levels[difficulty][level]
+    if y >= len(maze) or x >= len(maze[y]) or maze[y][x] == '#' or remaining == 0:
+        return None
+    
+    return difficulty, level, saved_score, x, y, remaining
+
+def resume_from_snapshot():
+    """Resume a saved game straight into play, return True on success"""
+    global selected_difficulty, current_level, score, player_x, player_y
+    global level_start_time, countdown_time, current_state, last_snapshot
+    
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return False
+    
+    difficulty, level, saved_score, x, y, remaining = snapshot
+    last_snapshot = bytes(microcontroller.nvm[0:snapshot_size])
+    selected_difficulty, current_level, score = difficulty, level, saved_score
+    load_level(current_level)
+    
+    player_x, player_y = x, y
+    countdown_time = min(remaining, level_time_limit)
+    level_start_time = time.monotonic() - (level_time_limit - countdown_time)
+    update_game_screen()
+    current_state = STATE_GAME_PLAYING
+    return True
+
+def handle_splash(current_time):
+    """Wait for a button press on the splash screen"""
+    global encoder_position, last_encoder_position, button_pressed
+    
+    if button_pressed:
+        encoder_position = 0
+        last_encoder_position = 0
+        show_state(STATE_DIFFICULTY_SELECT)
+        print("State changed: SPLASH -> DIFFICULTY_SELECT")
+        button_pressed = False
+
+def handle_difficulty_select(current_time):
+    """Cycle difficulty with the encoder and confirm with the button"""
+    global selected_difficulty, last_encoder_position, button_pressed
+    
+    # Handle encoder rotation to select difficulty
+    if encoder_position != last_encoder_position:
+        selected_difficulty = (selected_difficulty + 1) % len(difficulties)
+        update_difficulty_screen()
+        print(f"Difficulty selected: {difficulties[selected_difficulty]}")
+        last_encoder_position = encoder_position
+    
+    # Handle button confirmation
+    if button_pressed:
+        show_state(STATE_GAME_START)
+        print(f"State changed: DIFFICULTY_SELECT -> GAME_START")
+        button_pressed = False
+
+def handle_game_start(current_time):
+    """Start level 1 on button press"""
+    global current_level, score, current_state, button_pressed
+    
+    if button_pressed:
+        # Initialize game variables
+        current_level = 0
+        score = 0
+        load_level(current_level)
+        current_state = STATE_GAME_PLAYING
+        save_snapshot()
+        print("State changed: GAME_START -> GAME_PLAYING")
+        button_pressed = False
+
+def handle_game_playing(current_time):
+    """Run the countdown, tilt movement and exit confirmation"""
+    global countdown_time, last_display_update, selected_difficulty
+    global score, current_level, button_pressed, snapshot_pending
+    
+    # Update countdown
+    elapsed_time = current_time - level_start_time
+    countdown_time = max(0, level_time_limit - elapsed_time)
+    
+    # Reduce display update frequency to avoid flickering
+    if current_time - last_display_update > display_update_interval:
+        update_game_screen()
+        last_display_update = current_time
+    
+    # Check if time is up
+    if countdown_time <= 0:
+        clear_snapshot()
+        flash_led((255, 0, 0), 2)
+        selected_difficulty = 0
+        show_state(STATE_GAME_OVER)
+        print("Game Over - Time's up!")
+        return
+    
+    # Get tilt angles and process direction control
+    angle_x, angle_y = read_tilt_angles()
+    direction = check_direction(angle_x, angle_y, current_time)
+    
+    # Handle direction movement
+    if direction:
+        print(f"Moving: {direction}")
+        if move_player(direction):
+            # Update display immediately after moving
+            update_game_screen()
+            last_display_update = current_time
+            snapshot_pending = True
+    
+    # Checkpoint moves for instant resume, at most once per debounce period
+    if snapshot_pending and current_time - last_snapshot_time >= snapshot_debounce:
+        save_snapshot()
+    
+    # Check if reached the exit
+    if button_pressed:
+        if check_level_complete():
+            # Level completed
+            score += 10
+            current_level += 1
+            
+            if current_level >= 10:
+                # All levels completed
+                clear_snapshot()
+                rainbow_cycle(3)
+                selected_difficulty = 0
+                show_state(STATE_RESULT)
+                print("All levels completed!")
+            else:
+                # Move to next level, building its screen while the LED flashes
+                flash_led((0, 255, 0), 2, work=lambda: prepare_level(current_level))
+                load_level(current_level)
+                save_snapshot()
+                last_display_update = time.monotonic()
+                print(f"Level {current_level} completed! Moving to level {current_level + 1}")
+        else:
+            print("Not at exit position")
+        
+        button_pressed = False
+
+def handle_game_over(current_time):
+    """Handle button selection on the game over screen"""
+    global selected_difficulty, last_encoder_position, button_pressed
+    
+    if encoder_position != last_encoder_position:
+        selected_difficulty = (selected_difficulty + 1) % 2
+        update_option_cursor(screen_labels["result_options"], result_options, selected_difficulty)
+        last_encoder_position = encoder_position
+    
+    if button_pressed:
+        if selected_difficulty == 0:  # RESTART
+            show_state(STATE_GAME_START)
+        button_pressed = False
+
+def handle_result(current_time):
+    """Handle button selection on the victory result screen"""
+    global selected_difficulty, last_encoder_position, button_pressed
+    
+    if encoder_position != last_encoder_position:
+        selected_difficulty = (selected_difficulty + 1) % 2
+        update_option_cursor(screen_labels["result_options"], result_options, selected_difficulty)
+        last_encoder_position = encoder_position
+    
+    if button_pressed:
+        if selected_difficulty == 0:  # RESTART
+            show_state(STATE_GAME_START)
+        else:  # MAIN MENU
+            show_state(STATE_SPLASH)
+        button_pressed = False
+
+# State dispatch tables
+state_handlers = {
+    STATE_SPLASH: handle_splash,
+    STATE_DIFFICULTY_SELECT: handle_difficulty_select,
+    STATE_GAME_START: handle_game_start,
+    STATE_GAME_PLAYING: handle_game_playing,
+    STATE_GAME_OVER: handle_game_over,
+    STATE_RESULT: handle_result,
+}
+
+screen_updaters = {
+    STATE_DIFFICULTY_SELECT: update_difficulty_screen,
+    STATE_GAME_START: update_game_start_screen,
+    STATE_GAME_OVER: update_result_screen,
+    STATE_RESULT: update_result_screen,
+}
 
-print("Game Starting...")
+# adafruit_adxl34x has no public raw register access, so these two helpers are
+# the only callers of its private _read_register_unpacked/_write_register_byte
+def read_accel_register(register):
+    """Read an ADXL345 register"""
+    return accelerometer._read_register_unpacked(register)
+
+def write_accel_register(register, value):
+    """Write an ADXL345 register"""
+    accelerometer._write_register_byte(register, value)
+
+def configure_accelerometer_power():
+    """Enable ADXL345 low-power mode with linked activity/inactivity detection"""
+    write_accel_register(ADXL345_THRESH_ACT, activity_threshold)
+    write_accel_register(ADXL345_THRESH_INACT, inactivity_threshold)
+    write_accel_register(ADXL345_TIME_INACT, inactivity_time)
+    # AC-coupled activity and inactivity on all axes
+    write_accel_register(ADXL345_ACT_INACT_CTL, 0xFF)
+    # Low power at 50 Hz, still faster than the main loop
+    write_accel_register(ADXL345_BW_RATE, 0x19)
+    int_enable = read_accel_register(ADXL345_INT_ENABLE)
+    write_accel_register(ADXL345_INT_ENABLE, int_enable | ADXL345_ACTIVITY | ADXL345_INACTIVITY)
+    # Link activity/inactivity, auto sleep while inactive, keep measuring
+    write_accel_register(ADXL345_POWER_CTL, 0x38)
+
+def read_accel_events():
+    """Read and clear ADXL345 interrupt flags, tracking whether the device is moving"""
+    global accel_moving
+    
+    events = read_accel_register(ADXL345_INT_SOURCE)
+    if events & ADXL345_ACTIVITY:
+        accel_moving = True
+    elif events & ADXL345_INACTIVITY:
+        accel_moving = False
+    return events
+
+def read_tilt_angles():
+    """Return tilt angles, skipping the accelerometer read while the device is still and level"""
+    global accel_angles, accel_poll_count
+    
+    # INT_SOURCE is a 1-byte read, checked every few frames instead of every frame
+    accel_poll_count += 1
+    if accel_poll_count >= accel_event_poll_frames:
+        accel_poll_count = 0
+        read_accel_events()
+    
+    # A held tilt is still to the sensor, so only near-level readings may be reused
+    if (accel_moving or accel_angles is None
+            or abs(accel_angles[0]) > still_angle or abs(accel_angles[1]) > still_angle):
+        x, y, z = accelerometer.acceleration
+        accel_angles = calculate_angles(x, y, z)
+    return accel_angles
+
+def wake_display(current_time):
+    """Restore the display and restart the idle timer"""
+    global last_input_time, display_dimmed, display_sleeping
+    
+    last_input_time = current_time
+    if display_sleeping:
+        display.wake()
+        display_sleeping = False
+    if display_dimmed:
+        display.brightness = 1.0
+        display_dimmed = False
+
+def update_power(current_time):
+    """Dim and then turn off the display after a while without input"""
+    global display_dimmed, display_sleeping
+    
+    # The countdown keeps the display in use while playing
+    if current_state == STATE_GAME_PLAYING:
+        wake_display(current_time)
+        return
+    
+    # Tilting the device wakes the display once it is off, checked on each light
+    # sleep wake unless INT1 is wired to a pin alarm
+    if display_sleeping and accel_int_pin is None:
+        if read_accel_events() & ADXL345_ACTIVITY:
+            wake_display(current_time)
+            return
+    
+    idle_time = current_time - last_input_time
+    if idle_time > idle_sleep_timeout and not display_sleeping:
+        display.sleep()
+        display_sleeping = True
+    elif idle_time > idle_dim_timeout and not display_dimmed:
+        display.brightness = dim_brightness
+        display_dimmed = True
+
+def idle_sleep():
+    """Wait for the next frame, light sleeping until an alarm while the display is off"""
+    global button, button_pressed, last_button_value
+    
+    if not display_sleeping:
+        time.sleep(loop_interval)
+        return
+    
+    # The button pin has to be released before it can be used as an alarm
+    button.deinit()
+    alarms = [
+        alarm.time.TimeAlarm(monotonic_time=time.monotonic() + idle_poll_interval),
+        alarm.pin.PinAlarm(button_pin, value=False, pull=True),
+    ]
+    if accel_int_pin is not None:
+        alarms.append(alarm.pin.PinAlarm(accel_int_pin, value=True))
+    woken_by = alarm.light_sleep_until_alarms(*alarms)
+    button = init_button()
+    
+    if isinstance(woken_by, alarm.pin.PinAlarm):
+        # A press or tilt that wakes the display is not passed on to the game
+        if accel_int_pin is not None:
+            read_accel_events()
+        wake_display(time.monotonic())
+        last_button_value = button.value
+        button_pressed = False
 
 # Main loop variables
 last_display_update = 0
 display_update_interval = 0.3  # Increase display update interval
+loop_interval = 0.05
+
+def start():
+    """Initial display, resuming a saved game if one was interrupted"""
+    configure_accelerometer_power()
+    wake_display(time.monotonic())
+    build_screens()
+    if resume_from_snapshot():
+        print(f"Resumed {difficulties[selected_difficulty]} level {current_level + 1}")
+    else:
+        show_state(STATE_SPLASH)
+    
+    print("Game Starting...")
 
-while True:
-    current_time = time.monotonic()
+def poll_inputs(current_time):
+    """Read the rotary encoder and latch button presses"""
+    global encoder_position, last_encoder_position, last_encoder_time
+    global button_pressed, last_button_value
+    
     current_ms = current_time * 1000
     
     # Check rotary encoder
     encoder_changed = encoder.update()
     if encoder_changed:
-        if current_ms - last_encoder_time > encoder_debounce_ms:
+        if display_sleeping:
+            # Turning the encoder wakes the display without changing the selection
+            encoder_position = encoder.position
+            last_encoder_position = encoder_position
+            wake_display(current_time)
+        elif current_ms - last_encoder_time > encoder_debounce_ms:
             encoder_position = encoder.position
             last_encoder_time = current_ms
+            wake_display(current_time)
     
     # Check button
     current_button_value = button.value
     if last_button_value and not current_button_value:
-        button_pressed = True
-        print("Button pressed!")
+        if not display_sleeping:
+            button_pressed = True
+            print("Button pressed!")
+        wake_display(current_time)
     last_button_value = current_button_value
+
+def update(current_time):
+    """Run one frame of the game loop"""
+    poll_inputs(current_time)
     
     # State machine processing
-    if current_state == STATE_SPLASH:
-        if button_pressed:
-            current_state = STATE_DIFFICULTY_SELECT
-            encoder_position = 0
-            last_encoder_position = 0
-            display.root_group = create_difficulty_screen()
-            print("State changed: SPLASH -> DIFFICULTY_SELECT")
-            button_pressed = False
-    
-    elif current_state == STATE_DIFFICULTY_SELECT:
-        # Handle encoder rotation to select difficulty
-        if encoder_position != last_encoder_position:
-            selected_difficulty = (selected_difficulty + 1) % len(difficulties)
-            display.root_group = create_difficulty_screen()
-            print(f"Difficulty selected: {difficulties[selected_difficulty]}")
-            last_encoder_position = encoder_position
-        
-        # Handle button confirmation
-        if button_pressed:
-            current_state = STATE_GAME_START
-            display.root_group = create_game_start_screen()
-            print(f"State changed: DIFFICULTY_SELECT -> GAME_START")
-            button_pressed = False
-    
-    elif current_state == STATE_GAME_START:
-        if button_pressed:
-            # Initialize game variables
-            current_level = 0
-            score = 0
-            load_level(current_level)
-            current_state = STATE_GAME_PLAYING
-            display.root_group = create_game_screen()
-            print("State changed: GAME_START -> GAME_PLAYING")
-            button_pressed = False
-    
-    elif current_state == STATE_GAME_PLAYING:
-        # Update countdown
-        elapsed_time = current_time - level_start_time
-        countdown_time = max(0, level_times[difficulties[selected_difficulty]] - elapsed_time)
-        
-        # Reduce display update frequency to avoid flickering
-        if current_time - last_display_update > display_update_interval:
-            display.root_group = create_game_screen()
-            last_display_update = current_time
-        
-        # Check if time is up
-        if countdown_time <= 0:
-            current_state = STATE_GAME_OVER
-            flash_led((255, 0, 0), 2)
-            selected_difficulty = 0
-            display.root_group = create_result_screen(False)
-            print("Game Over - Time's up!")
-            continue
-        
-        # Get accelerometer data and process direction control
-        x, y, z = accelerometer.acceleration
-        angle_x, angle_y = calculate_angles(x, y, z)
-        direction = check_direction(angle_x, angle_y, current_time)
-        
-        # Handle direction movement
-        if direction:
-            print(f"Moving: {direction}")
-            if move_player(direction):
-                # Update display immediately after moving
-                display.root_group = create_game_screen()
-                last_display_update = current_time
-        
-        # Check if reached the exit
-        if button_pressed:
-            if check_level_complete():
-                # Level completed
-                score += 10
-                current_level += 1
-                
-                if current_level >= 10:
-                    # All levels completed
-                    current_state = STATE_RESULT
-                    rainbow_cycle(3)
-                    selected_difficulty = 0
-                    display.root_group = create_result_screen(True)
-                    print("All levels completed!")
-                else:
-                    # Move to next level
-                    flash_led((0, 255, 0), 2)
-                    load_level(current_level)
-                    display.root_group = create_game_screen()
-                    last_display_update = current_time
-                    print(f"Level {current_level} completed! Moving to level {current_level + 1}")
-            else:
-                print("Not at exit position")
-            
-            button_pressed = False
+    state_handlers[current_state](current_time)
     
-    elif current_state == STATE_GAME_OVER:
-        # Handle button selection on result screen
-        if encoder_position != last_encoder_position:
-            selected_difficulty = (selected_difficulty + 1) % 2
-            display.root_group = create_result_screen(False)
-            last_encoder_position = encoder_position
-        
-        if button_pressed:
-            if selected_difficulty == 0:  # RESTART
-                current_state = STATE_GAME_START
-                display.root_group = create_game_start_screen()
-    
-    elif current_state == STATE_RESULT:
-        # Handle button selection on victory result screen
-        if encoder_position != last_encoder_position:
-            selected_difficulty = (selected_difficulty + 1) % 2
-            display.root_group = create_result_screen(True)
-            last_encoder_position = encoder_position
-        
-        if button_pressed:
-            if selected_difficulty == 0:  # RESTART
-                current_state = STATE_GAME_START
-                display.root_group = create_game_start_screen()
-            else:  # MAIN MENU
-                current_state = STATE_SPLASH
-                display.root_group = create_splash_screen()
-            button_pressed = False
-    
-    time.sleep(0.05)
+    update_power(current_time)
+
+def main():
+    """Start the game and run the main loop forever"""
+    start()
+    
+    while True:
+        update(time.monotonic())
+        idle_sleep()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# Generated by tools/level_analytics.py - do not edit by hand
+# Per-level time limits in seconds, indexed [selected_difficulty][level]
+level_time_limits = [
+    [58, 53, 47, 44, 48, 47, 50, 41, 41, 44],  # EASY
+    [45, 42, 38, 35, 39, 38, 40, 33, 33, 36],  # NORMAL
+    [27, 29, 29, 28, 25, 25, 27, 27, 26, 30],  # HARD
+]
@@ -0,0 +1,286 @@
+# Maze definitions
+easy_levels = [
+    [
+        "########",
+        "#S     #",
+        "#      #",
+        "#      #",
+        "#      #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# ##   #",
+        "#      #",
+        "#      #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "#  ##  #",
+        "#      #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# ###  #",
+        "#      #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "#  ##  #",
+        "#   #  #",
+        "#   #  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "#  #   #",
+        "#  #   #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "#  #   #",
+        "#  ##  #",
+        "#      #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# #### #",
+        "#      #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "#  #####",
+        "#      #",
+        "# #### #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# ###  #",
+        "#   #  #",
+        "# ###  #",
+        "#     E#",
+        "########",
+    ],
+]
+
+normal_levels = [
+    [
+        "########",
+        "#     S#",
+        "#      #",
+        "#      #",
+        "#      #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#   ## #",
+        "#      #",
+        "#      #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#  ##  #",
+        "#      #",
+        "#  ##  #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#  ### #",
+        "#      #",
+        "#  ##  #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#  ##  #",
+        "#  #   #",
+        "#  #   #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#   # S#",
+        "#   #  #",
+        "#   #  #",
+        "#  ##  #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#   # S#",
+        "#   #  #",
+        "#  ##  #",
+        "#      #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "# #### #",
+        "#      #",
+        "#  ##  #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#####  #",
+        "#      #",
+        "# #### #",
+        "#E     #",
+        "########",
+    ],
+    [
+        "########",
+        "#     S#",
+        "#  ### #",
+        "#  #   #",
+        "#  ### #",
+        "#E     #",
+        "########",
+    ],
+]
+
+hard_levels = [
+    [
+        "########",
+        "#S     #",
+        "# ###  #",
+        "#      #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "#  ##  #",
+        "#   #  #",
+        "#   #  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "#  #   #",
+        "#  #   #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "#  #   #",
+        "#  ##  #",
+        "#      #",
+        "#    E #",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# #### #",
+        "#      #",
+        "#  ##  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "#  #####",
+        "#      #",
+        "# #### #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# ###  #",
+        "#   #  #",
+        "# ###  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S     #",
+        "# ###  #",
+        "#   #  #",
+        "### #  #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "# # ## #",
+        "# #  # #",
+        "# #### #",
+        "#     E#",
+        "########",
+    ],
+    [
+        "########",
+        "#S #   #",
+        "# ###  #",
+        "#   #  #",
+        "### #  #",
+        "#     E#",
+        "########",
+    ],
+]
+
+# Organize levels by difficulty
+maze_levels = [
+    easy_levels,    # selected_difficulty == 0
+    normal_levels,  # selected_difficulty == 1
+    hard_levels,    # selected_difficulty == 2
+]
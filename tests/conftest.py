@@ -0,0 +1,236 @@
+"""Host benchmark harness: runs src/code.py on CPython with stand-in device modules."""
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(TESTS_DIR), "src")
+BASELINE_PATH = os.path.join(TESTS_DIR, "benchmark_baseline.json")
+RESULTS_PATH = os.path.join(TESTS_DIR, "benchmark_results.json")
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "stubs"))
+# Appended so src/code.py does not shadow the stdlib code module
+sys.path.append(SRC_DIR)
+
+import adafruit_display_text.label  # noqa: E402
+import alarm  # noqa: E402
+import displayio  # noqa: E402
+import microcontroller  # noqa: E402
+
+# Allowed growth before a metric counts as a regression, by metric suffix.
+# Counts are deterministic and always checked. Heap depends on the Python
+# version, so it is only checked when the baseline was recorded on the same
+# one. Timings depend on the machine, so they are only checked with
+# --check-benchmark-timings or MAZE_BENCH_CHECK_TIMINGS=1.
+time_tolerance = float(os.environ.get("MAZE_BENCH_TIME_TOLERANCE", "3.0"))
+tolerances = {
+    "_us": time_tolerance,
+    "_per_s": time_tolerance,
+    "_bytes": 1.25,
+    "_count": 1.0,
+}
+timing_suffixes = ("_us", "_per_s")
+heap_suffixes = ("_bytes",)
+python_version = "%d.%d" % sys.version_info[:2]
+
+# Accelerometer readings (x, y, z) that tilt the device about 40 degrees
+tilts = {
+    "UP": (-6.0, 0.0, 7.5),
+    "DOWN": (6.0, 0.0, 7.5),
+    "LEFT": (0.0, 6.0, 7.5),
+    "RIGHT": (0.0, -6.0, 7.5),
+}
+level_tilt = (0.0, 0.0, 9.8)
+
+steps = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-benchmark-baseline", action="store_true",
+                     help="write this run's results as the new benchmark baseline")
+    parser.addoption("--check-benchmark-timings", action="store_true",
+                     default=os.environ.get("MAZE_BENCH_CHECK_TIMINGS") == "1",
+                     help="also fail on frame time and throughput regressions")
+
+
+class VirtualClock:
+    """Replaces the time module inside the game so sleeps cost no wall time"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def load_game():
+    """Import a fresh copy of src/code.py driven by a virtual clock"""
+    microcontroller.nvm[:] = bytes(len(microcontroller.nvm))
+    microcontroller.nvm.writes = 0
+    spec = importlib.util.spec_from_file_location("maze_game", os.path.join(SRC_DIR, "code.py"))
+    game = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(game)
+    game.print = lambda *args, **kwargs: None
+    game.time = VirtualClock()
+    alarm.clock = game.time
+    alarm.wake_pin = None
+    return game
+
+
+def display_objects_created():
+    """Groups and labels created so far"""
+    return displayio.Group.created + adafruit_display_text.label.Label.created
+
+
+def solve(maze, start, goal):
+    """Shortest list of directions from start to goal"""
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            break
+        for direction, (dx, dy) in steps.items():
+            x, y = cell[0] + dx, cell[1] + dy
+            if maze[y][x] != "#" and (x, y) not in previous:
+                previous[(x, y)] = (cell, direction)
+                queue.append((x, y))
+
+    path = []
+    cell = goal
+    while previous[cell] is not None:
+        cell, direction = previous[cell]
+        path.append(direction)
+    return path[::-1]
+
+
+class GameDriver:
+    """Feeds scripted input to the game one frame at a time and times each frame"""
+
+    def __init__(self, game):
+        self.game = game
+        self.clock = game.time
+        self.frame_times = []
+        self.moves = 0
+        game.start()
+
+    def frame(self):
+        start = time.perf_counter()
+        self.game.update(self.clock.now)
+        self.frame_times.append(time.perf_counter() - start)
+        self.game.idle_sleep()
+
+    def press_button(self):
+        self.game.button.value = False
+        self.frame()
+        self.game.button.value = True
+        self.frame()
+
+    def turn_encoder(self, steps=1):
+        self.game.encoder.turn(steps)
+        self.frame()
+
+    def select_difficulty(self, difficulty):
+        """Go from the splash screen to level 1 of a difficulty"""
+        self.press_button()
+        while self.game.selected_difficulty != difficulty:
+            self.clock.sleep(self.game.encoder_debounce_ms / 1000)
+            self.turn_encoder()
+        self.press_button()
+        self.press_button()
+
+    def move(self, direction, max_frames=100):
+        """Tilt until the player takes one step in direction"""
+        position = (self.game.player_x, self.game.player_y)
+        self.game.accelerometer.acceleration = tilts[direction]
+        for _ in range(max_frames):
+            self.frame()
+            if (self.game.player_x, self.game.player_y) != position:
+                self.moves += 1
+                return
+        raise AssertionError(f"player did not move {direction} from {position}")
+
+    def solve_level(self):
+        """Walk the shortest path to the exit and confirm it with the button"""
+        game = self.game
+        maze = game.maze_levels[game.selected_difficulty][game.current_level]
+        for direction in solve(maze, (game.player_x, game.player_y), (game.exit_x, game.exit_y)):
+            self.move(direction)
+        game.accelerometer.acceleration = level_tilt
+        self.press_button()
+
+
+@pytest.fixture
+def game():
+    return load_game()
+
+
+@pytest.fixture
+def driver(game):
+    return GameDriver(game)
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    results = {"python_version": python_version}
+    yield results
+
+    with open(RESULTS_PATH, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    if request.config.getoption("--update-benchmark-baseline"):
+        baseline = _load_json(BASELINE_PATH)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+@pytest.fixture
+def record(request, benchmark_results):
+    """Record a benchmark's metrics and fail if any regressed against the baseline"""
+    name = request.node.name
+    baselines = _load_json(BASELINE_PATH)
+    baseline = baselines.get(name, {})
+    update = request.config.getoption("--update-benchmark-baseline")
+    check_timings = request.config.getoption("--check-benchmark-timings")
+    check_heap = baselines.get("python_version") == python_version
+
+    def record(metrics):
+        benchmark_results[name] = metrics
+        if update:
+            return
+        regressions = []
+        for metric, value in metrics.items():
+            if metric not in baseline:
+                continue
+            suffix = next(s for s in tolerances if metric.endswith(s))
+            if suffix in timing_suffixes and not check_timings:
+                continue
+            if suffix in heap_suffixes and not check_heap:
+                continue
+            expected = baseline[metric]
+            if suffix == "_per_s":
+                regressed = value < expected / tolerances[suffix]
+            else:
+                regressed = value > expected * tolerances[suffix]
+            if regressed:
+                regressions.append(f"{metric}: {value} vs baseline {expected}")
+        assert not regressions, "benchmark regressions:\n" + "\n".join(regressions)
+
+    return record
@@ -0,0 +1,49 @@
+_THRESH_ACT = 0x24
+_INT_SOURCE = 0x30
+_ACTIVITY = 0x10
+_INACTIVITY = 0x08
+_THRESH_SCALE = 0.0625 * 9.80665  # m/s^2 per THRESH_ACT LSB
+
+
+class ADXL345:
+    """Accelerometer whose reading is set by the test harness.
+
+    Like the real part's AC-coupled detection, a change of more than THRESH_ACT
+    on any axis latches an activity interrupt. settle() latches an inactivity
+    interrupt, standing in for TIME_INACT seconds below THRESH_INACT.
+    """
+
+    def __init__(self, i2c, address=0x53):
+        self.i2c = i2c
+        self.registers = {}
+        self.reads = 0
+        self.register_reads = 0
+        self._acceleration = (0.0, 0.0, 9.8)
+        self._reference = self._acceleration
+
+    @property
+    def acceleration(self):
+        self.reads += 1
+        return self._acceleration
+
+    @acceleration.setter
+    def acceleration(self, value):
+        threshold = self.registers.get(_THRESH_ACT, 0) * _THRESH_SCALE
+        if max(abs(new - old) for new, old in zip(value, self._reference)) > threshold:
+            self.registers[_INT_SOURCE] = self.registers.get(_INT_SOURCE, 0) | _ACTIVITY
+            self._reference = value
+        self._acceleration = value
+
+    def settle(self):
+        self.registers[_INT_SOURCE] = self.registers.get(_INT_SOURCE, 0) | _INACTIVITY
+        self._reference = self._acceleration
+
+    def _write_register_byte(self, register, value):
+        self.registers[register] = value
+
+    def _read_register_unpacked(self, register):
+        self.register_reads += 1
+        value = self.registers.get(register, 0)
+        if register == _INT_SOURCE:
+            self.registers[register] = 0
+        return value
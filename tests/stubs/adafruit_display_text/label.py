@@ -0,0 +1,11 @@
+class Label:
+    """Text label that counts how many have been created"""
+    created = 0
+
+    def __init__(self, font, text="", x=0, y=0, scale=1):
+        Label.created += 1
+        self.font = font
+        self.text = text
+        self.x = x
+        self.y = y
+        self.scale = scale
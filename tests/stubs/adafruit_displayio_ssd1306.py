@@ -0,0 +1,14 @@
+class SSD1306:
+    def __init__(self, bus, width, height):
+        self.bus = bus
+        self.width = width
+        self.height = height
+        self.root_group = None
+        self.brightness = 1.0
+        self.is_awake = True
+
+    def sleep(self):
+        self.is_awake = False
+
+    def wake(self):
+        self.is_awake = True
@@ -0,0 +1,18 @@
+"""Alarm stand-in; light sleep jumps the harness's virtual clock to the next alarm"""
+from . import pin, time
+
+clock = None  # Set by the harness to the game's virtual clock
+wake_pin = None  # Pin whose alarm ends the next light sleep, set by the harness
+
+
+def light_sleep_until_alarms(*alarms):
+    global wake_pin
+    for pin_alarm in alarms:
+        if isinstance(pin_alarm, pin.PinAlarm) and pin_alarm.pin == wake_pin:
+            wake_pin = None
+            return pin_alarm
+    for time_alarm in alarms:
+        if isinstance(time_alarm, time.TimeAlarm):
+            clock.now = max(clock.now, time_alarm.monotonic_time)
+            return time_alarm
+    return None
@@ -0,0 +1,4 @@
+class TimeAlarm:
+    def __init__(self, monotonic_time=None, epoch_time=None):
+        self.monotonic_time = monotonic_time
+        self.epoch_time = epoch_time
@@ -0,0 +1,8 @@
+# Stand-in pin names for running the game on CPython
+SCL = "SCL"
+SDA = "SDA"
+D1 = "D1"
+D2 = "D2"
+D3 = "D3"
+D6 = "D6"
+D7 = "D7"
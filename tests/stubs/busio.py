@@ -0,0 +1,4 @@
+class I2C:
+    def __init__(self, scl, sda):
+        self.scl = scl
+        self.sda = sda
@@ -0,0 +1,11 @@
+def release_displays():
+    pass
+
+
+class Group(list):
+    """Display group that counts how many have been created"""
+    created = 0
+
+    def __init__(self):
+        super().__init__()
+        Group.created += 1
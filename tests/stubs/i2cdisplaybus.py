@@ -0,0 +1,4 @@
+class I2CDisplayBus:
+    def __init__(self, i2c, device_address):
+        self.i2c = i2c
+        self.device_address = device_address
@@ -0,0 +1,10 @@
+class _NVM(bytearray):
+    """Flash-backed NVM stand-in that counts writes"""
+    writes = 0
+
+    def __setitem__(self, index, value):
+        self.writes += 1
+        super().__setitem__(index, value)
+
+
+nvm = _NVM(8192)
@@ -0,0 +1,12 @@
+class NeoPixel(list):
+    def __init__(self, pin, n, brightness=1.0, auto_write=True):
+        super().__init__([(0, 0, 0)] * n)
+        self.pin = pin
+        self.brightness = brightness
+        self.auto_write = auto_write
+
+    def fill(self, color):
+        self[:] = [color] * len(self)
+
+    def show(self):
+        pass
@@ -0,0 +1,2 @@
+def colorwheel(position):
+    return position & 0xFF
@@ -0,0 +1,15 @@
+class RotaryEncoder:
+    """Encoder whose position is moved by the test harness"""
+
+    def __init__(self, pin_a, pin_b, pulses_per_detent=1):
+        self.position = 0
+        self.changed = False
+
+    def update(self):
+        changed = self.changed
+        self.changed = False
+        return changed
+
+    def turn(self, steps=1):
+        self.position += steps
+        self.changed = True
@@ -0,0 +1,323 @@
+import gc
+import math
+import tracemalloc
+
+import alarm
+import pytest
+
+from conftest import display_objects_created, level_tilt, load_game, tilts
+
+
+def _frame_metrics(frame_times):
+    ordered = sorted(frame_times)
+    return {
+        "frame_mean_us": round(sum(ordered) / len(ordered) * 1e6, 2),
+        "frame_p95_us": round(ordered[int(len(ordered) * 0.95)] * 1e6, 2),
+    }
+
+
+@pytest.mark.parametrize("difficulty", [0, 1, 2], ids=["easy", "normal", "hard"])
+def test_all_levels(driver, record, difficulty):
+    """Play every level of a difficulty through to the victory screen"""
+    game = driver.game
+    gc.collect()
+    tracemalloc.start()
+    try:
+        driver.select_difficulty(difficulty)
+        assert game.current_state == game.STATE_GAME_PLAYING
+
+        for level in range(10):
+            assert game.current_level == level
+            driver.solve_level()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert game.current_state == game.STATE_RESULT
+    assert game.score == 100
+
+    metrics = _frame_metrics(driver.frame_times)
+    metrics.update({
+        "frames_count": len(driver.frame_times),
+        "moves_count": driver.moves,
+        "nvm_writes_count": game.microcontroller.nvm.writes,
+        "moves_per_s": round(driver.moves / sum(driver.frame_times), 1),
+        "peak_heap_bytes": peak,
+    })
+    record(metrics)
+
+
+def test_level_transition(driver, record):
+    """Exit confirmation swaps in a screen prebuilt during the LED flash"""
+    game = driver.game
+    driver.select_difficulty(0)
+    maze_objects = len(game.current_display_group)
+
+    built = []
+    prepare_level = game.prepare_level
+    game.prepare_level = lambda level_index: built.append(game.time.now) or prepare_level(level_index)
+    driver.solve_level()
+
+    assert game.current_level == 1
+    assert len(built) == 1
+    # The screen is built as the flash starts and the clock starts when it ends
+    assert game.level_start_time - built[0] == pytest.approx(1.2)
+    assert game.display.root_group is game.current_display_group
+
+    record({
+        "transition_frame_us": round(driver.frame_times[-2] * 1e6, 2),
+        "level_screen_objects_count": maze_objects,
+    })
+
+
+def test_game_screen_render(driver, record):
+    """Building a level screen allocates once, in-place updates allocate nothing"""
+    game = driver.game
+    driver.select_difficulty(2)
+
+    before = display_objects_created()
+    game.prepare_level(game.current_level)
+    build_objects = display_objects_created() - before
+    assert build_objects == len(game.prepared_level[5]) + 1
+
+    before = display_objects_created()
+    for _ in range(100):
+        game.countdown_time -= 1
+        game.update_game_screen()
+    assert display_objects_created() == before
+
+    for _ in range(20):
+        driver.frame()
+    record({
+        "build_game_screen_objects_count": build_objects,
+        "update_game_screen_objects_count": display_objects_created() - before,
+        "playing_idle_frame_us": _frame_metrics(driver.frame_times[-20:])["frame_mean_us"],
+    })
+
+
+def test_menu_states(driver, record):
+    """Menu navigation reuses the preconstructed screens"""
+    game = driver.game
+    assert game.display.root_group is game.screens[game.STATE_SPLASH]
+
+    before = display_objects_created()
+    driver.press_button()
+    assert game.current_state == game.STATE_DIFFICULTY_SELECT
+    for _ in range(30):
+        driver.clock.sleep(0.1)
+        driver.turn_encoder()
+    driver.press_button()
+    assert game.current_state == game.STATE_GAME_START
+    assert game.display.root_group is game.screens[game.STATE_GAME_START]
+
+    record({
+        "menu_objects_count": display_objects_created() - before,
+        "menu_frame_us": _frame_metrics(driver.frame_times)["frame_mean_us"],
+    })
+
+
+def test_game_over_and_restart(driver, record):
+    """Running out of time shows the result screen and restart returns to play"""
+    game = driver.game
+    driver.select_difficulty(1)
+
+    frames = 0
+    while game.current_state == game.STATE_GAME_PLAYING:
+        driver.frame()
+        frames += 1
+    assert game.current_state == game.STATE_GAME_OVER
+    assert game.display.root_group is game.screens[game.STATE_GAME_OVER]
+    assert game.load_snapshot() is None
+
+    before = display_objects_created()
+    driver.press_button()
+    assert game.current_state == game.STATE_GAME_START
+    driver.press_button()
+    assert game.current_state == game.STATE_GAME_PLAYING
+
+    record({
+        "timeout_frames_count": frames,
+        "restart_objects_count": display_objects_created() - before,
+    })
+
+
+def test_resume_from_snapshot(driver, record):
+    """A checkpoint taken mid-level resumes straight into play"""
+    game = driver.game
+    driver.select_difficulty(2)
+    driver.solve_level()
+    driver.move("DOWN")
+    game.save_snapshot()
+    saved = (game.current_level, game.score, game.player_x, game.player_y)
+
+    # Checkpoints repeat while nothing changes, so they are not rewritten
+    writes = game.microcontroller.nvm.writes
+    game.save_snapshot()
+    assert game.microcontroller.nvm.writes == writes
+
+    nvm = bytes(game.microcontroller.nvm)
+    resumed = load_game()
+    resumed.microcontroller.nvm[:] = nvm
+    resumed.start()
+    assert resumed.current_state == resumed.STATE_GAME_PLAYING
+    assert (resumed.current_level, resumed.score, resumed.player_x, resumed.player_y) == saved
+    assert resumed.selected_difficulty == 2
+    record({"snapshot_size_count": resumed.snapshot_size})
+
+
+def test_resume_with_little_time_left(driver):
+    """A checkpoint taken with under 10 s left still resumes with that time"""
+    game = driver.game
+    driver.select_difficulty(2)
+    for _ in range(3):
+        driver.solve_level()
+    game.accelerometer.acceleration = level_tilt
+    while game.countdown_time > 8.5:
+        driver.frame()
+    # The move checkpoint is the first write since the level started
+    writes = game.microcontroller.nvm.writes
+    driver.move("RIGHT")
+    assert game.microcontroller.nvm.writes == writes + 1
+    remaining = game.countdown_time
+
+    nvm = bytes(game.microcontroller.nvm)
+    resumed = load_game()
+    resumed.microcontroller.nvm[:] = nvm
+    resumed.start()
+    assert resumed.current_state == resumed.STATE_GAME_PLAYING
+    assert (resumed.current_level, resumed.score) == (3, 30)
+    assert remaining <= resumed.countdown_time < remaining + 1
+
+
+def test_idle_display_power(driver, record):
+    """Waiting screens dim, then switch the display off and light sleep until input"""
+    game = driver.game
+    display = game.display
+    register_reads = game.accelerometer.register_reads
+
+    while game.time.now - game.last_input_time <= game.idle_dim_timeout:
+        driver.frame()
+    driver.frame()
+    assert display.brightness == game.dim_brightness
+    assert display.is_awake
+
+    # The accelerometer is only polled once the display is off
+    assert game.accelerometer.register_reads == register_reads
+    while not game.display_sleeping:
+        driver.frame()
+    assert not display.is_awake
+
+    # One frame per light sleep period while the display is off
+    frames = len(driver.frame_times)
+    start = game.time.now
+    while game.time.now - start < 10:
+        driver.frame()
+    sleeping_frames = len(driver.frame_times) - frames
+
+    # A button press only wakes the display
+    alarm.wake_pin = game.button_pin
+    driver.frame()
+    assert display.is_awake and display.brightness == 1.0
+    driver.frame()
+    assert game.current_state == game.STATE_SPLASH
+
+    # So does tilting the device once the display is off again
+    while not game.display_sleeping:
+        driver.frame()
+    game.accelerometer.acceleration = tilts["LEFT"]
+    driver.frame()
+    assert display.is_awake
+    assert game.current_state == game.STATE_SPLASH
+
+    record({"sleeping_frames_count": sleeping_frames})
+
+
+def _tilt_right(degrees):
+    """Accelerometer reading for a tilt to the right by degrees"""
+    angle = math.radians(degrees)
+    return (0.0, -9.8 * math.sin(angle), 9.8 * math.cos(angle))
+
+
+def test_still_device_skips_reads(driver, record):
+    """Acceleration is only read while the ADXL345 reports activity"""
+    game = driver.game
+    accelerometer = game.accelerometer
+    driver.select_difficulty(0)
+    driver.move("RIGHT")
+
+    accelerometer.acceleration = level_tilt
+    for _ in range(game.accel_event_poll_frames):
+        driver.frame()
+    accelerometer.settle()
+    for _ in range(game.accel_event_poll_frames):
+        driver.frame()
+    reads = accelerometer.reads
+    register_reads = accelerometer.register_reads
+    for _ in range(100):
+        driver.frame()
+    still_reads = accelerometer.reads - reads
+    # Only INT_SOURCE is polled, once every accel_event_poll_frames frames
+    int_source_reads = accelerometer.register_reads - register_reads
+    assert still_reads == 0
+    assert int_source_reads == 100 // game.accel_event_poll_frames
+    assert game.display.is_awake
+
+    # The smallest tilt that moves the player exceeds the activity threshold
+    position = game.player_x
+    accelerometer.acceleration = _tilt_right(game.angle_threshold + 1)
+    for _ in range(20):
+        driver.frame()
+    assert game.player_x > position
+
+    record({
+        "still_accel_reads_count": still_reads,
+        "still_int_source_reads_count": int_source_reads,
+    })
+
+
+def test_settled_tilt_keeps_reading(driver):
+    """Settling at a small tilt does not hide a further tilt the same way"""
+    game = driver.game
+    accelerometer = game.accelerometer
+    driver.select_difficulty(0)
+
+    # Inside the dead zone, so the player stays put while the device settles
+    accelerometer.acceleration = _tilt_right(15)
+    for _ in range(game.accel_event_poll_frames):
+        driver.frame()
+    accelerometer.settle()
+    position = game.player_x
+    for _ in range(20):
+        driver.frame()
+    assert game.player_x == position
+
+    # Less than THRESH_ACT away from the settled pose, so no activity latches
+    accelerometer.acceleration = _tilt_right(28)
+    assert not accelerometer.registers.get(0x30)
+    for _ in range(60):
+        driver.frame()
+    assert game.player_x > position
+
+
+def test_held_tilt_keeps_reading(driver):
+    """Holding a tilt still is not mistaken for a level device"""
+    game = driver.game
+    accelerometer = game.accelerometer
+    driver.select_difficulty(0)
+
+    accelerometer.acceleration = _tilt_right(30)
+    driver.frame()
+    accelerometer.settle()
+    position = game.player_x
+    for _ in range(20):
+        driver.frame()
+    assert game.player_x > position
+
+    # Easing back inside the dead zone is below the activity threshold
+    accelerometer.acceleration = _tilt_right(15)
+    assert not accelerometer.registers.get(0x30)
+    driver.frame()
+    position = game.player_x
+    for _ in range(40):
+        driver.frame()
+    assert game.player_x == position
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+import level_analytics  # noqa: E402
+from conftest import load_game  # noqa: E402
+from level_limits import level_time_limits  # noqa: E402
+from levels import maze_levels  # noqa: E402
+
+
+def test_level_limits_up_to_date():
+    """src/level_limits.py matches what the analytics tool derives"""
+    limits, metrics = level_analytics.pack_time_limits(maze_levels)
+    assert limits == level_time_limits
+    assert metrics["reachable"].all()
+
+
+def test_movement_timing_matches_game():
+    """The tool reads the direction detection settings the game runs with"""
+    game = load_game()
+    assert level_analytics.duration_threshold == game.duration_threshold
+    assert level_analytics.direction_cooldown == game.direction_cooldown
+    assert level_analytics.loop_period == game.loop_interval
+
+
+def test_analytics_throughput(record):
+    """Batch analysis of a large pack of mazes"""
+    mazes = [maze for levels in maze_levels for maze in levels] * 100
+
+    start = time.perf_counter()
+    metrics = level_analytics.analyze(mazes)
+    elapsed = time.perf_counter() - start
+
+    assert len(metrics["moves"]) == len(mazes)
+    record({"analyze_mazes_per_s": round(len(mazes) / elapsed, 1)})
@@ -0,0 +1,302 @@
+"""Host-side level analytics for Maze Run.
+
+Loads level packs into NumPy grids, measures every maze in one batch and
+derives per-level time limits from the tilt movement timing used by
+check_direction() in src/code.py. Run on a PC, not on the device:
+
+    python tools/level_analytics.py                 # print the report
+    python tools/level_analytics.py --write         # regenerate src/level_limits.py
+"""
+import argparse
+import ast
+import os
+import runpy
+import sys
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PACK = os.path.join(REPO_DIR, "src", "levels.py")
+DEFAULT_OUTPUT = os.path.join(REPO_DIR, "src", "level_limits.py")
+GAME_SOURCE = os.path.join(REPO_DIR, "src", "code.py")
+
+difficulties = ["EASY", "NORMAL", "HARD"]
+
+
+def game_settings(path, names):
+    """Literal values of module-level assignments in the game source.
+
+    The source is parsed rather than imported, so the device modules it
+    imports are not needed on the host.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    settings = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id in names):
+            settings[node.targets[0].id] = ast.literal_eval(node.value)
+    missing = [name for name in names if name not in settings]
+    if missing:
+        raise ValueError(f"{path} does not assign {', '.join(missing)}")
+    return settings
+
+
+# Movement timing, read from the direction detection settings in src/code.py:
+# the hold before the first move, the minimum time between two moves, and the
+# main loop sleep, which adds up to one period of latency per move
+_settings = game_settings(GAME_SOURCE, ("duration_threshold", "direction_cooldown", "loop_interval"))
+duration_threshold = _settings["duration_threshold"]
+direction_cooldown = _settings["direction_cooldown"]
+loop_period = _settings["loop_interval"]
+
+# Seconds per move: the first move only waits for the hold, a straight move
+# only for the cooldown, and a turn also restarts the hold after the cooldown
+first_move_time = duration_threshold + loop_period
+straight_move_time = direction_cooldown + loop_period
+turn_time = duration_threshold
+
+# Time limit calibration. Effort is the fastest tilt-timed run plus time to
+# plan each turn, to pass side openings and to back out of dead ends; the limit
+# is the read time plus a per-mode multiple of it, capped at the old flat limits
+read_time = 5  # Looking at the maze and pressing the button at the exit
+turn_time_planning = 1.0  # Deciding on the next corner, per turn of the route
+side_opening_time = 0.5  # Per open side passed, a mean branching above 2 per move
+dead_end_time = 1.0  # Expected cost of each dead end a player may wander into
+time_slack = {"EASY": 4.5, "NORMAL": 3.5, "HARD": 2.5}
+max_time_limits = {"EASY": 60, "NORMAL": 45, "HARD": 30}  # Original flat limits
+min_time_limit = 10
+
+# Row/column offsets for UP, DOWN, LEFT, RIGHT
+directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def load_pack(path):
+    """Load a level pack as a list of difficulties, each a list of mazes.
+
+    A .py pack must define maze_levels like src/levels.py does. A text pack
+    holds one maze per block of lines, blocks separated by blank lines, and
+    is treated as a single difficulty.
+    """
+    if path.endswith(".py"):
+        return runpy.run_path(path)["maze_levels"]
+
+    mazes = []
+    maze = []
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.strip():
+                maze.append(line)
+            elif maze:
+                mazes.append(maze)
+                maze = []
+    if maze:
+        mazes.append(maze)
+    return [mazes]
+
+
+def to_grids(mazes):
+    """Stack mazes into boolean grids padded with walls.
+
+    Returns (open_cells, starts, exits) where open_cells has shape
+    (N, H, W) and starts/exits are (N, 2) arrays of (row, col).
+    """
+    height = max(len(maze) for maze in mazes)
+    width = max(len(row) for maze in mazes for row in maze)
+
+    chars = np.full((len(mazes), height, width), ord("#"), dtype=np.uint8)
+    for i, maze in enumerate(mazes):
+        for row, line in enumerate(maze):
+            chars[i, row, :len(line)] = np.frombuffer(line.encode(), dtype=np.uint8)
+
+    open_cells = chars != ord("#")
+    starts = _find(chars, "S")
+    exits = _find(chars, "E")
+    return open_cells, starts, exits
+
+
+def _find(chars, char):
+    """Position of the first occurrence of char in each grid"""
+    flat = (chars == ord(char)).reshape(len(chars), -1)
+    if not flat.any(axis=1).all():
+        missing = int(np.argmin(flat.any(axis=1)))
+        raise ValueError(f"maze {missing} has no '{char}'")
+    index = flat.argmax(axis=1)
+    return np.stack(np.unravel_index(index, chars.shape[1:]), axis=1)
+
+
+def _shift(grid, d_row, d_col, fill):
+    """Shift the last two axes so out[.., r, c] = grid[.., r - d_row, c - d_col]"""
+    out = np.full_like(grid, fill)
+    height, width = grid.shape[-2:]
+    out[..., max(d_row, 0):height + min(d_row, 0), max(d_col, 0):width + min(d_col, 0)] = \
+        grid[..., max(-d_row, 0):height + min(-d_row, 0), max(-d_col, 0):width + min(-d_col, 0)]
+    return out
+
+
+def _at(grid, positions):
+    """Value of each grid at its (row, col) position"""
+    return grid[np.arange(len(grid)), positions[:, 0], positions[:, 1]]
+
+
+def degree(open_cells):
+    """Number of open neighbours of every open cell"""
+    count = np.zeros(open_cells.shape, dtype=np.int8)
+    for d_row, d_col in directions:
+        count += _shift(open_cells, d_row, d_col, False)
+    return np.where(open_cells, count, 0)
+
+
+def distance_fields(open_cells, starts):
+    """BFS step distance from the start of every maze, -1 where unreachable"""
+    dist = np.full(open_cells.shape, -1, dtype=np.int16)
+    frontier = np.zeros(open_cells.shape, dtype=bool)
+    frontier[np.arange(len(open_cells)), starts[:, 0], starts[:, 1]] = True
+    dist[frontier] = 0
+
+    steps = 0
+    while frontier.any():
+        steps += 1
+        reached = np.zeros_like(frontier)
+        for d_row, d_col in directions:
+            reached |= _shift(frontier, d_row, d_col, False)
+        frontier = reached & open_cells & (dist < 0)
+        dist[frontier] = steps
+    return dist
+
+
+def direction_costs(open_cells, starts, first, straight, turn):
+    """Cheapest cost to reach every cell, per heading, under a move/turn cost model.
+
+    Returns an (N, 4, H, W) array. Relaxation runs on the whole batch at once
+    until no cost improves.
+    """
+    shape = (len(open_cells), len(directions)) + open_cells.shape[1:]
+    cost = np.full(shape, np.inf)
+    # The first move costs `first` and never counts as a turn
+    cost[np.arange(len(open_cells)), :, starts[:, 0], starts[:, 1]] = first - straight
+
+    while True:
+        best = cost.min(axis=1)
+        updated = cost.copy()
+        for d, (d_row, d_col) in enumerate(directions):
+            arrive = np.minimum(cost[:, d], best + turn) + straight
+            arrive = np.where(open_cells, _shift(arrive, d_row, d_col, np.inf), np.inf)
+            updated[:, d] = np.minimum(updated[:, d], arrive)
+        if np.array_equal(updated, cost):
+            return cost
+        cost = updated
+
+
+def analyze(mazes):
+    """Compute difficulty metrics for a batch of mazes.
+
+    Returns a dict of per-maze arrays: moves (shortest path length), turns
+    (fewest direction changes on any path), min_time (seconds under the
+    tilt timing), dead_ends, branching (mean open neighbours of reachable
+    cells) and reachable (whether the exit can be reached).
+    """
+    open_cells, starts, exits = to_grids(mazes)
+
+    dist = distance_fields(open_cells, starts)
+    reachable = dist >= 0
+    moves = _at(dist, exits)
+
+    neighbours = degree(open_cells)
+    is_endpoint = np.zeros_like(open_cells)
+    is_endpoint[np.arange(len(mazes)), starts[:, 0], starts[:, 1]] = True
+    is_endpoint[np.arange(len(mazes)), exits[:, 0], exits[:, 1]] = True
+    dead_ends = (reachable & (neighbours == 1) & ~is_endpoint).sum(axis=(1, 2))
+    branching = np.where(reachable, neighbours, 0).sum(axis=(1, 2)) / reachable.sum(axis=(1, 2))
+
+    timed = direction_costs(open_cells, starts, first_move_time, straight_move_time, turn_time)
+    min_time = _at(timed.min(axis=1), exits)
+    # With free moves and unit turns the cost is the minimum-turn count
+    turning = direction_costs(open_cells, starts, 0, 0, 1)
+    turns = _at(turning.min(axis=1), exits)
+
+    return {
+        "moves": moves,
+        "turns": turns,
+        "min_time": min_time,
+        "dead_ends": dead_ends,
+        "branching": branching,
+        "reachable": moves >= 0,
+    }
+
+
+def time_limits(metrics, difficulty):
+    """Whole-second time limits for mazes of one difficulty"""
+    side_openings = metrics["moves"] * np.maximum(metrics["branching"] - 2, 0)
+    effort = (metrics["min_time"] + turn_time_planning * metrics["turns"]
+              + side_opening_time * side_openings + dead_end_time * metrics["dead_ends"])
+    limits = np.ceil(read_time + time_slack[difficulty] * effort)
+    limits = np.clip(limits, min_time_limit, max_time_limits[difficulty])
+    return np.where(metrics["reachable"], limits, max_time_limits[difficulty]).astype(int)
+
+
+def pack_time_limits(maze_levels):
+    """Per-level time limits for every difficulty of a pack, with their metrics"""
+    mazes = [maze for levels in maze_levels for maze in levels]
+    metrics = analyze(mazes)
+
+    limits = []
+    offset = 0
+    for index, levels in enumerate(maze_levels):
+        part = {name: values[offset:offset + len(levels)] for name, values in metrics.items()}
+        limits.append([int(limit) for limit in time_limits(part, difficulties[index])])
+        offset += len(levels)
+    return limits, metrics
+
+
+def format_limits_module(limits):
+    """Source of the generated level_limits module"""
+    lines = [
+        "# Generated by tools/level_analytics.py - do not edit by hand",
+        "# Per-level time limits in seconds, indexed [selected_difficulty][level]",
+        "level_time_limits = [",
+    ]
+    for index, row in enumerate(limits):
+        values = ", ".join(str(limit) for limit in row)
+        lines.append(f"    [{values}],  # {difficulties[index]}")
+    lines.append("]")
+    return "\n".join(lines) + "\n"
+
+
+def print_report(maze_levels, limits, metrics):
+    """Print one line of metrics per level"""
+    print("mode    lvl  moves  turns  min_s  dead  branch  limit")
+    i = 0
+    for index, levels in enumerate(maze_levels):
+        for level in range(len(levels)):
+            if not metrics["reachable"][i]:
+                print(f"{difficulties[index]:<7} {level + 1:>3}  exit unreachable")
+            else:
+                print(f"{difficulties[index]:<7} {level + 1:>3}  {metrics['moves'][i]:>5}  "
+                      f"{int(metrics['turns'][i]):>5}  {metrics['min_time'][i]:>5.2f}  "
+                      f"{metrics['dead_ends'][i]:>4}  {metrics['branching'][i]:>6.2f}  "
+                      f"{limits[index][level]:>5}")
+            i += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze maze levels and derive time limits")
+    parser.add_argument("--pack", default=DEFAULT_PACK, help="level pack (.py or .txt)")
+    parser.add_argument("--write", nargs="?", const=DEFAULT_OUTPUT, default=None,
+                        help="write the limits module (default: src/level_limits.py)")
+    args = parser.parse_args(argv)
+
+    maze_levels = load_pack(args.pack)
+    limits, metrics = pack_time_limits(maze_levels)
+    print_report(maze_levels, limits, metrics)
+
+    if args.write:
+        with open(args.write, "w") as f:
+            f.write(format_limits_module(limits))
+        print(f"Wrote {args.write}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())